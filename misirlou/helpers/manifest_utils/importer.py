@@ -1,11 +1,13 @@
-import ujson as json
+import re
 import uuid
+import codecs
 import urllib
 import hashlib
 import requests
 import scorched
 import datetime
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import django.core.exceptions as django_exceptions
 from django.conf import settings
@@ -16,7 +18,23 @@ from misirlou.models import Manifest
 from misirlou.signals import manifest_imported
 from misirlou.helpers.manifest_utils.errors import ErrorMap
 from misirlou.helpers.manifest_utils.utils import get_language
-from misirlou.helpers.requester import DEFAULT_REQUESTER
+from misirlou.helpers.requester import DEFAULT_REQUESTER, MAX_CONC_REQUESTS
+
+try:
+    import orjson
+
+    json_loads = orjson.loads
+
+    def json_dumps(obj):
+        """Serialize obj to a JSON str (orjson itself returns bytes).
+
+        The str is required: scorched re-encodes documents with the stdlib
+        json module, which rejects bytes. orjson writes non-ASCII characters
+        as raw UTF-8, so the output can't be decoded as ASCII.
+        """
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    from ujson import loads as json_loads, dumps as json_dumps
 
 indexed_langs = ["en", "fr", "it", "de"]
 timeout_error = "Timed out fetching '{}'"
@@ -24,12 +42,56 @@ ERROR_MAP = ErrorMap()
 
 requester = DEFAULT_REQUESTER
 
+# SolrInterfaces shared within this process, keyed by server url.
+_solr_interfaces = {}
+
+# An optional leading scheme, then '//' and the netloc (as urlsplit() reads it).
+_NETLOC_RE = re.compile(r'(?:[A-Za-z][A-Za-z0-9+\-.]*:)?//([^/?#]*)')
+
 
 def get_doc(remote_url):
     """Get a document using requests."""
     return requester.get(remote_url, verify=False, timeout=20)
 
 
+def parse_doc(resp):
+    """Parse the JSON document in a response.
+
+    The raw bytes are parsed directly when they are UTF-8. A leading byte
+    order mark is dropped, and other encodings are decoded through requests'
+    charset detection.
+
+    :param resp: A requests response.
+    :return: Tuple of (UTF-8 bytes of the document, parsed json).
+    """
+    body = resp.content
+    if body.startswith(codecs.BOM_UTF8):
+        body = body[len(codecs.BOM_UTF8):]
+    try:
+        return body, json_loads(body)
+    except ValueError:
+        body = resp.text.lstrip('\ufeff').encode('utf-8')
+        return body, json_loads(body)
+
+
+def get_solr_con():
+    """Get the shared SolrInterface for settings.SOLR_SERVER.
+
+    Creating a SolrInterface fetches the schema from solr, so one is
+    built per server and reused for every import in this process.
+    """
+    server = settings.SOLR_SERVER
+    if server not in _solr_interfaces:
+        _solr_interfaces[server] = scorched.SolrInterface(server)
+    return _solr_interfaces[server]
+
+
+def _netloc(url):
+    """Get the netloc of url without building a full urlparse() result."""
+    match = _NETLOC_RE.match(url)
+    return match.group(1) if match else ''
+
+
 class ManifestImportError(Exception):
     """Catch-all error to end import and clean up."""
     pass
@@ -48,21 +110,27 @@ class ManifestPreImporter:
         self.remote_url = remote_url
         self.errors = []
         self.warnings = []
-        self.text = None
+        self.content = None
+        self.manifest_hash = ""
         self.json = {}
         self.type = ""
         self._prepare_for_creation()
 
+    @property
+    def text(self):
+        """The fetched document decoded to text, or None if nothing was fetched."""
+        if self.content is None:
+            return None
+        return self.content.decode('utf-8')
+
     def _prepare_for_creation(self):
         try:
             manifest_resp = get_doc(self.remote_url)
         except requests.exceptions.Timeout:
             self.errors.append(timeout_error.format(self.remote_url))
             return
-        self.text = manifest_resp.text
-
         try:
-            self.json = json.loads(self.text)
+            self.content, self.json = parse_doc(manifest_resp)
         except ValueError:
             self.errors.append("Retrieved document is not valid JSON.")
             return
@@ -80,6 +148,10 @@ class ManifestPreImporter:
                 self.errors.append("Manifest has no @id value.")
                 return
 
+        # Hash now so the importer doesn't need to re-walk the same bytes.
+        if self.type == "sc:Manifest":
+            self.manifest_hash = ManifestImporter.generate_manifest_hash(self.content)
+
     def get_all_urls(self):
         """Get all the importable URLs related to the remote_url.
 
@@ -97,6 +169,9 @@ class ManifestPreImporter:
     def _get_nested_manifests(self, json_obj, manifest_set=None):
         """Find and add nested manifest urls to manifest_set.
 
+        The collection tree is walked one level at a time so that all the
+        linked collections at a given depth can be fetched concurrently.
+
         :param json_obj: A json decoded Manifest or Collection.
         :param manifest_set: A set for collecting remote_urls.
         :return: A list of urls of manifests.
@@ -104,13 +179,36 @@ class ManifestPreImporter:
         if manifest_set is None:
             manifest_set = set()
 
+        # Don't fetch the collection we started from again if a child links back to it.
+        seen_urls = {self.remote_url, json_obj.get('@id')}
+        frontier = [json_obj]
+        while frontier:
+            linked_urls = []
+            for col_json in frontier:
+                for url in self._collect_embedded(col_json, manifest_set):
+                    if url not in seen_urls:
+                        seen_urls.add(url)
+                        linked_urls.append(url)
+            frontier = self._fetch_collections(linked_urls)
+
+        return list(manifest_set)
+
+    def _collect_embedded(self, json_obj, manifest_set):
+        """Add manifest urls embedded in json_obj to manifest_set.
+
+        :param json_obj: A json decoded Manifest or Collection.
+        :param manifest_set: A set for collecting remote_urls.
+        :return: A list of urls of linked (non-embedded) collections.
+        """
+        linked_urls = []
+
         # Recurse into members key.
         members = json_obj.get('members', [])
         for member in members:
             if member['@type'] == 'sc:Manifest':
                 manifest_set.add(member['@id'])
             if member['@type'] == 'sc:Collection:':
-                self._get_nested_manifests(member, manifest_set)
+                linked_urls.extend(self._collect_embedded(member, manifest_set))
 
         # Handle an embedded list of manifests.
         manifests = json_obj.get('manifests', [])
@@ -124,24 +222,41 @@ class ManifestPreImporter:
             # Handle embedded collections.
             manifests = col.get('manifests')
             if manifests:
-                self._get_nested_manifests(col, manifest_set)
+                linked_urls.extend(self._collect_embedded(col, manifest_set))
                 continue
 
             # Handle linked collections.
             col_url = col.get("@id")
-            if not col_url:
-                continue
-            try:
-                col_resp = get_doc(col_url)
-            except requests.exceptions.Timeout:
-                self.errors.append("Timed out fetching nested collection at '{}'".format(col_url))
-                continue
+            if col_url:
+                linked_urls.append(col_url)
 
-            col_data = col_resp.text
-            col_json = json.loads(col_data)
-            self._get_nested_manifests(col_json, manifest_set)
+        return linked_urls
 
-        return list(manifest_set)
+    def _fetch_collections(self, col_urls):
+        """Concurrently fetch and parse the collections at col_urls.
+
+        :param col_urls: A list of urls of linked collections.
+        :return: A list of the json decoded collections that were retrieved.
+        """
+        if not col_urls:
+            return []
+        workers = min(MAX_CONC_REQUESTS, len(col_urls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._fetch_collection, col_urls))
+        return [col_json for col_json in results if col_json is not None]
+
+    def _fetch_collection(self, col_url):
+        """Fetch and parse a single linked collection, or None on failure."""
+        try:
+            col_resp = get_doc(col_url)
+        except requests.exceptions.Timeout:
+            self.errors.append("Timed out fetching nested collection at '{}'".format(col_url))
+            return None
+        try:
+            return parse_doc(col_resp)[1]
+        except ValueError:
+            self.errors.append("Nested collection at '{}' is not valid JSON.".format(col_url))
+            return None
 
 
 class ManifestImporter:
@@ -150,12 +265,13 @@ class ManifestImporter:
     create() handles retrieval, validation, parsing and indexing of a manifest.
     """
 
-    def __init__(self, remote_url, shared_id=None, prefetched_data=None):
+    def __init__(self, remote_url, shared_id=None, prefetched_data=None, prefetched_hash=None):
         """Create a ManifestImporter.
 
         :param remote_url: URL of IIIF manifest.
         :param shared_id: ID to apply as the manifest's uuid.
         :param prefetched_data: Text of manifest at remote url.
+        :param prefetched_hash: Hash of prefetched_data, if already computed.
         :return:
         """
         self.remote_url = remote_url
@@ -166,8 +282,8 @@ class ManifestImporter:
         self.db_rep = None
         self.manifest_hash = ""
         if prefetched_data:
-            self.manifest_hash = self.generate_manifest_hash(prefetched_data)
-            self.json = json.loads(prefetched_data)
+            self.manifest_hash = prefetched_hash or self.generate_manifest_hash(prefetched_data)
+            self.json = json_loads(prefetched_data)
         else:
             self.json = {}
 
@@ -235,13 +351,16 @@ class ManifestImporter:
 
     def __validate(self):
         """Validate for proper IIIF API formatting"""
-        from misirlou.helpers.manifest_utils.library_specific_exceptions import get_validator
+        from misirlou.helpers.manifest_utils.library_specific_exceptions import get_validator, reset_validator
         v = get_validator(self.remote_url)
         v.logger.disabled = True
         v.fail_fast = True
         v.validate(self.json)
+        # The validator is shared, so don't keep this manifest alive in it.
+        corrected_doc = v.corrected_doc
+        reset_validator(v)
         if v.is_valid:
-            self.json = v.corrected_doc
+            self.json = corrected_doc
             self.warnings.extend(str(warn) for warn in v.warnings)
             return
         else:
@@ -265,9 +384,12 @@ class ManifestImporter:
             except requests.exceptions.Timeout:
                 self.errors.append(timeout_error.format(self.remote_url))
                 raise ManifestImportError
-            manifest_data = manifest_resp.text
-            self.manifest_hash = self.generate_manifest_hash(manifest_data)
-            self.json = json.loads(manifest_data)
+            try:
+                body, self.json = parse_doc(manifest_resp)
+            except ValueError:
+                self.errors.append("Retrieved document is not valid JSON.")
+                raise ManifestImportError
+            self.manifest_hash = self.generate_manifest_hash(body)
 
         doc_id = self.json.get("@id")
         if self._compare_url_id(self.remote_url, doc_id):
@@ -280,11 +402,9 @@ class ManifestImporter:
         :param doc_id (str): Url at @id in the document.
         :return (bool): True if the urls match, false otherwise.
         """
-        rem = urllib.parse.urlparse(remote_url)
-        doc = urllib.parse.urlparse(doc_id)
-        if rem[1] != doc[1]:
+        if not isinstance(doc_id, str):
             return False
-        return True
+        return _netloc(remote_url) == _netloc(doc_id)
 
     def _find_existing_db_rep(self):
         """Check for duplicate in the DB and take its info it if exists.
@@ -318,13 +438,15 @@ class ManifestImporter:
             return True
 
     @staticmethod
-    def generate_manifest_hash(manifest_text):
-        """Compute and return a hash for the manifest text."""
-        return hashlib.sha1(manifest_text.encode('utf-8')).hexdigest()
+    def generate_manifest_hash(manifest_data):
+        """Compute and return a hash for the manifest bytes (or text)."""
+        if isinstance(manifest_data, str):
+            manifest_data = manifest_data.encode('utf-8')
+        return hashlib.sha1(manifest_data).hexdigest()
 
     def _solr_index(self):
         """Parse values from manifest and index in solr"""
-        solr_con = scorched.SolrInterface(settings.SOLR_SERVER)
+        solr_con = get_solr_con()
 
         self.doc = {'id': self.id,
                     'type': self.json.get('@type'),
@@ -338,28 +460,29 @@ class ManifestImporter:
 
         self.doc['created_timestamp'] = created
 
-        multilang_fields = ["description", "attribution", "label",]
+        json_get = self.json.get
+        doc = self.doc
+        multilang_fields = ("description", "attribution", "label")
         for field in multilang_fields:
-            if not self.json.get(field):
+            value = json_get(field)
+            if not value:
                 continue
 
-            value = self.json.get(field)
-            if type(value) is not list:
-                self.doc[field] = value
+            if not isinstance(value, list):
+                doc[field] = value
                 continue
 
             found_default = False
             for v in value:
+                at_value = v.get('@value')
                 if get_language(v).startswith("en"):
-                    self.doc[field] = v.get('@value')
-                    self.doc[field+"_txt_en"] = v.get('@value')
+                    doc[field] = at_value
+                    doc[field+"_txt_en"] = at_value
                     found_default = True
                     continue
-                key = field + '_txt_' + v.get('@language')
-                self.doc[key] = v.get('@value')
+                doc[field + '_txt_' + v.get('@language')] = at_value
             if not found_default:
-                v = value[0]
-                self.doc[field] = v.get('@value')
+                doc[field] = value[0].get('@value')
 
         if self.json.get('metadata'):
             meta = self.json.get('metadata')
@@ -381,11 +504,15 @@ class ManifestImporter:
         """Grabbing the logo"""
         logo = self.json.get('logo')
         if logo:
-            self.doc['logo'] = json.dumps(logo)
+            self.doc['logo'] = json_dumps(logo)
 
         self.doc = self._remove_html(self.doc)
-        self.doc['manifest'] = json.dumps(self.json)
+        # Serialize rather than store the fetched bytes: self.json is the
+        # validator's corrected_doc, which is what the stored copy must hold.
+        self.doc['manifest'] = json_dumps(self.json)
 
+        # No explicit commit: the core's autoSoftCommit/autoCommit settings
+        # (solrconfig.xml) coalesce the adds of a whole collection import.
         solr_con.add(self.doc)
 
     def _remove_html(self, doc):
@@ -406,26 +533,27 @@ class ManifestImporter:
         if not force_IIIF:
             thumbnail = self.json.get('thumbnail')
             if thumbnail:
-                return json.dumps(thumbnail)
+                return json_dumps(thumbnail)
 
-        tree = ['sequences', 'canvases', 'images']
-        branch = self.json
         warning = "Could not find default thumbnail. Tree ends at {0}."
-        for key in tree:
-            branch = branch.get(key)
-            if not branch:
-                self.warnings.append(warning.format(key))
-                return
-            if key == 'canvases':
-                canvas_index = index if index is not None else int(len(branch)/2)
-                branch = branch[canvas_index]
-            else:
-                branch = branch[0]
-        resource = branch.get('resource')
+        sequences = self.json.get('sequences')
+        if not sequences:
+            self.warnings.append(warning.format('sequences'))
+            return
+        canvases = sequences[0].get('canvases')
+        if not canvases:
+            self.warnings.append(warning.format('canvases'))
+            return
+        canvas_index = index if index is not None else len(canvases) // 2
+        images = canvases[canvas_index].get('images')
+        if not images:
+            self.warnings.append(warning.format('images'))
+            return
+        resource = images[0].get('resource')
         if resource:
             if resource.get('item'):
                 del resource['item']
-            return json.dumps(resource)
+            return json_dumps(resource)
 
     def _find_source(self):
         """Try to find a source this manifest belongs to.
@@ -437,7 +565,7 @@ class ManifestImporter:
 
     def _solr_delete(self):
         """ Delete document of self from solr"""
-        solr_con = scorched.SolrInterface(settings.SOLR_SERVER)
+        solr_con = get_solr_con()
         solr_con.delete_by_ids([self.id])
 
 
@@ -465,9 +593,11 @@ class IIIFMetadataParser:
         self._normalized_metadata = self.normalize_metadata(metadata_list)
 
     def parse_for_solr(self, metadata_list=None):
+        # The metadata given at creation is already normalized.
         if metadata_list is None:
-            metadata_list = self._normalized_metadata
-        normalized_metadata = self.normalize_metadata(metadata_list)
+            normalized_metadata = self._normalized_metadata
+        else:
+            normalized_metadata = self.normalize_metadata(metadata_list)
         metadata = defaultdict(list)
 
         for entry in normalized_metadata:
@@ -493,24 +623,23 @@ class IIIFMetadataParser:
         result = defaultdict(list)
         label = label if label is not None else 'metadata'
         found_english = False
+        non_english = []
 
-        # Loop over once to try to find an english values for the default.
+        # Loop over once to find english values for the default, setting
+        # the other (language, value) pairs aside.
         for val in value:
             at_lang = val['@language']
+            at_val = val['@value']
             if at_lang.startswith('en'):
                 found_english = True
-                result[label + "_txt_en"].append(val['@value'])
+                result[label + "_txt_en"].append(at_val)
                 if label != 'metadata':
-                    result[label].append(val['@value'])
-
-        # Strip the english values if they've already been found and added.
-        if found_english:
-            value = filter(lambda x: False if x['@language'].startswith('en') else True, value)
+                    result[label].append(at_val)
+            else:
+                non_english.append((at_lang, at_val))
 
         # Add the remaining values.
-        for val in value:
-            at_lang = val['@language']
-            at_val = val['@value']
+        for at_lang, at_val in non_english:
             if at_lang != '':
                 result[label + "_txt_" + at_lang].append(at_val)
             elif found_english:
@@ -526,17 +655,16 @@ class IIIFMetadataParser:
         :param label: A list of {'@language': str, '@value': str} dicts.
         :return A str if normalization found, else None.
         """
+        get_norm_label = self.LABEL_MAP.get
         non_en_norm = None
         for l in label:
-            label_language = l['@language'].lower()
-            label_value = l['@value'].lower()
-
-            if label_language.startswith('en'):
-                norm_label = self.LABEL_MAP.get(label_value)
-                if norm_label:
-                    return norm_label
-            elif label_value in self.LABEL_MAP:
-                non_en_norm = self.LABEL_MAP[label_value]
+            # One lookup per label; only matches need their language checked.
+            norm_label = get_norm_label(l['@value'].lower())
+            if not norm_label:
+                continue
+            if l['@language'].lower().startswith('en'):
+                return norm_label
+            non_en_norm = norm_label
         return non_en_norm
 
     def normalize_metadata(self, metadata_list):
@@ -593,7 +721,7 @@ class IIIFMetadataParser:
         return result_list
 
 
-def get_importer(uri, prefetched_data=None):
+def get_importer(uri, prefetched_data=None, prefetched_hash=None):
     """Return a ManifestImporter with settings for a specific library."""
     import misirlou.helpers.manifest_utils.library_specific_exceptions as libraries
 
@@ -607,4 +735,4 @@ def get_importer(uri, prefetched_data=None):
     else:
         importer = ManifestImporter
 
-    return importer(uri, prefetched_data=prefetched_data)
+    return importer(uri, prefetched_data=prefetched_data, prefetched_hash=prefetched_hash)
@@ -175,22 +175,51 @@ def get_wdl_org_validator():
     return get_harvard_edu_validator()
 
 
-def get_validator(uri):
-    """Configure a schemas based on settings relevant to given uri."""
+# Validators configured so far, keyed by the function that configured them.
+_validators = {}
+
 
-    parsed = urllib.parse.urlparse(uri)
-    netloc = parsed.netloc
+def get_validator(uri):
+    """Get the validator configured for the library hosting the given uri.
+
+    Building a validator sets up all of its sub-validators, so one validator
+    is kept per library configuration (all unrecognised hosts share the
+    default one) and reset before it is handed out again.
+    """
+    factory = _validator_factory(urllib.parse.urlparse(uri).netloc)
+    validator = _validators.get(factory)
+    if validator is None:
+        validator = _validators[factory] = factory()
+    reset_validator(validator)
+    return validator
+
+
+def reset_validator(validator):
+    """Drop the corrected document a previous manifest left in validator.
+
+    validate() resets validity, errors and warnings, but a sub-validator that
+    fails keeps the corrected_doc of its last successful run, which would
+    then be reported as this run's corrected_doc.
+    """
+    validator.corrected_doc = {}
+    for sub in (validator.ManifestValidator, validator.SequenceValidator,
+                validator.CanvasValidator, validator.AnnotationValidator,
+                validator.ImageContentValidator):
+        sub.corrected_doc = None
+
+
+def _validator_factory(netloc):
+    """Get the function configuring a validator for the given netloc."""
     if netloc == "iiif.lib.harvard.edu":
-        return get_harvard_edu_validator()
+        return get_harvard_edu_validator
+    # Stanford and wdl only apply the harvard corrections.
+    if netloc in ("purl.stanford.edu", "www.wdl.org"):
+        return get_harvard_edu_validator
     if netloc == "digi.vatlib.it":
-        return get_vatlib_it_validator()
-    if netloc == "purl.stanford.edu":
-        return get_stanford_edu_validator()
+        return get_vatlib_it_validator
     if netloc == "iiif.archivelab.org":
-        return get_archivelab_org_validator()
+        return get_archivelab_org_validator
     if netloc == "gallica.bnf.fr":
-        return get_gallica_bnf_fr_validator()
-    if netloc == "www.wdl.org":
-        return get_wdl_org_validator()
+        return get_gallica_bnf_fr_validator
 
-    return IIIFValidator()
+    return IIIFValidator
@@ -18,7 +18,7 @@ import django.core.exceptions as django_exceptions
 from django.utils import timezone
 
 import misirlou.models as models
-from misirlou.helpers.manifest_utils.importer import ManifestImporter
+from misirlou.helpers.manifest_utils.importer import ManifestImporter, parse_doc
 from misirlou.helpers.manifest_utils.errors import ErrorMap
 from misirlou.helpers.requester import DEFAULT_REQUESTER
 
@@ -171,8 +171,8 @@ class ManifestTester:
         if (resp.status_code < 200 or resp.status_code >= 400) and self.RAISE_FAILED_REMOTE_RETRIEVAL:
             self._handle_err("FAILED_REMOTE_RETRIEVAL")
 
-        self.remote_hash = ManifestImporter.generate_manifest_hash(resp.text)
-        self.remote_json = json.loads(resp.text)
+        body, self.remote_json = parse_doc(resp)
+        self.remote_hash = ManifestImporter.generate_manifest_hash(body)
 
     def _compare_manifest_hashes(self):
         """Test that the stored hash is equal to the contents at the remote.
@@ -2,10 +2,14 @@ import time
 import requests
 import redis
 import redlock
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlsplit
 
 from django.conf import settings
 
+# Maximum number of requests made at the same time (e.g. fetching nested collections).
+MAX_CONC_REQUESTS = 10
+
 
 def get_crawl_delay(domain):
     """Figure out the lowest crawl delay in the robots.txt of this domain.
@@ -46,11 +50,22 @@ def get_domain(url):
 class DomainBasedRespectfulRequester:
     """Makes requests while attempting to respect a domains robots.txt"""
 
+    # Number of hosts to keep connection pools for, and connections kept per host.
+    _pool_connections = MAX_CONC_REQUESTS
+    _pool_maxsize = MAX_CONC_REQUESTS * 2
+
     def __init__(self):
         """Create a DomainBasedFuzzingRequester"""
         self._domain_crawl_delay = {}
         self._domain_last_hit_time = {}
 
+        # Share one session so connections (and TLS handshakes) are reused.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self._pool_connections,
+                              pool_maxsize=self._pool_maxsize)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
     def get(self, url, **kwargs):
         """Make a request with respect to the crawl-delay on a particular domain."""
 
@@ -70,7 +85,7 @@ class DomainBasedRespectfulRequester:
         self._domain_last_hit_time[domain] = time.time()
 
         # get the stuff using requests
-        resp = requests.get(url, **kwargs)
+        resp = self._session.get(url, **kwargs)
         return resp
 
 
@@ -125,6 +140,6 @@ class RedisRespectfulRequester(DomainBasedRespectfulRequester):
             self._redlock.unlock(lock)
 
         # Get the thing.
-        return requests.get(url, **kwargs)
+        return self._session.get(url, **kwargs)
 
 DEFAULT_REQUESTER = RedisRespectfulRequester()
@@ -10,6 +10,9 @@ from django.core.management.base import BaseCommand
 UPLOAD_POLL_WAIT_SECS = 0.25
 UPLOAD_PROGRESS_STEP = 5
 
+# Let solr coalesce the commits for each batch added (in milliseconds).
+SOLR_COMMIT_WITHIN_MS = 10000
+
 
 class Command(BaseCommand):
     """Import a csv file into solr omr core"""
@@ -68,8 +71,7 @@ def upload_to_solr(filename, document_id, label_map, doc="Liber"):
             if row['folio'] != last_folio:
                 last_folio = row['folio']
                 if len(doc_lst) > 100000:
-                    solr_con.add(doc_lst)
-                    solr_con.commit()
+                    solr_con.add(doc_lst, commitWithin=SOLR_COMMIT_WITHIN_MS)
                     doc_lst = []
                 page += 1
                 last_url = label_map[last_folio]
@@ -81,3 +83,5 @@ def upload_to_solr(filename, document_id, label_map, doc="Liber"):
             del row['folio']
             del row['type']
             doc_lst.append(row)
+    if doc_lst:
+        solr_con.add(doc_lst, commitWithin=SOLR_COMMIT_WITHIN_MS)
@@ -211,9 +211,18 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_REDIS_MAX_CONNECTIONS = 1000
 CELERY_TIMEZONE = 'UTC'
 
+# Manifest imports vary hugely in duration. With a multiplier of 1 and late
+# acks on import_single_manifest, a worker process only reserves the import
+# it's running; the rest stay on the queue for whichever is idle. This is a
+# worker-wide setting, so it also applies to workers on the test queue.
+CELERYD_PREFETCH_MULTIPLIER = 1
+
 # Route celery settings for different configs.
 if SETTING_TYPE != LOCAL:
     CELERY_QUEUE_DICT = {
+        # Imports spend most of their time waiting on remote libraries (crawl
+        # delays and fetches) rather than validating, so the worker consuming
+        # this queue can run with a concurrency above the number of CPUs.
         "import": {'queue': 'musiclibs_import'},
         "test": {'queue': 'musiclibs_test'}
     }
@@ -13,16 +13,19 @@ from .helpers.manifest_utils.importer import get_importer
 ImportResult = namedtuple('ImportResult', ['status', 'id', 'url', 'errors', 'warnings'])
 
 
-@shared_task
-def import_single_manifest(man_data, remote_url, force=False):
+# Acknowledged late so a worker doesn't reserve another import while this one
+# runs. Re-running an import after a crash is safe (see ManifestImporter.create).
+@shared_task(acks_late=True)
+def import_single_manifest(man_data, remote_url, force=False, man_hash=None):
     """Import a single manifest.
 
     :param man_data: Pre-fetched text of data from remote_url
     :param remote_url: Url of manifest.
     :param force: Bool to force reimport (won't check if existing db rep is identical).
+    :param man_hash: Pre-computed hash of man_data, if available.
     :return: ImportResult with all information about the result of this task.
     """
-    man = get_importer(remote_url, prefetched_data=man_data)
+    man = get_importer(remote_url, prefetched_data=man_data, prefetched_hash=man_hash)
     errors = []
     warnings = []
 
@@ -20,3 +20,28 @@ class PreImporterTestCase(MisirlouTestSetup):
         pre_importer = ManifestPreImporter("http://localhost:8888/misirlou/tests/fixtures/collection_top.json")
         url_list = pre_importer.get_all_urls()
         self.assertListEqual(['http://localhost:8888/misirlou/tests/fixtures/manifest.json'], url_list)
+
+    def test_get_linked_cols_with_back_link(self):
+        """ Walk two levels of linked collections without re-fetching visited ones."""
+        top_url = "http://localhost:8888/misirlou/tests/fixtures/collection_linked_top.json"
+        pre_importer = ManifestPreImporter(top_url)
+        fetched = []
+        fetch_collection = pre_importer._fetch_collection
+
+        def recording_fetch(col_url):
+            fetched.append(col_url)
+            return fetch_collection(col_url)
+        pre_importer._fetch_collection = recording_fetch
+
+        url_list = pre_importer.get_all_urls()
+        self.assertListEqual(['http://localhost:8888/misirlou/tests/fixtures/manifest.json'], url_list)
+        self.assertListEqual([], pre_importer.errors)
+        self.assertNotIn(top_url, fetched)
+        self.assertEqual(len(fetched), len(set(fetched)))
+
+    def test_get_manifest_with_bom(self):
+        """ A UTF-8 byte order mark before the JSON is ignored."""
+        pre_importer = ManifestPreImporter("http://localhost:8888/misirlou/tests/fixtures/manifest_bom.json")
+        url_list = pre_importer.get_all_urls()
+        self.assertListEqual([], pre_importer.errors)
+        self.assertListEqual(['http://localhost:8888/misirlou/tests/fixtures/manifest_bom.json'], url_list)
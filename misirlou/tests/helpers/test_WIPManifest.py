@@ -1,9 +1,10 @@
-from misirlou.helpers.manifest_utils.importer import ManifestImporter, IIIFMetadataParser
+from misirlou.helpers.manifest_utils.importer import ManifestImporter, IIIFMetadataParser, _netloc
 from misirlou.models.manifest import Manifest
 from misirlou.tests.mis_test import MisirlouTestSetup
 import uuid
 import ujson as json
 from urllib.request import urlopen
+from urllib.parse import urlsplit
 
 
 class ManifestImporterTestCase(MisirlouTestSetup):
@@ -62,6 +63,25 @@ class ManifestImporterTestCase(MisirlouTestSetup):
         response = self.solr_con.query(id=self.v_id).execute()
         self.assertEqual(response.result.numFound, 0)
 
+    def test_netloc(self):
+        """The netloc helper agrees with urlsplit for the urls manifests use.
+
+        Only a scheme at the very start of the url counts, so relative urls
+        that embed another url in their query have no netloc.
+        """
+        urls = ["http://localhost:8888/misirlou/tests/fixtures/manifest.json",
+                "https://user@Example.org:443/iiif/manifest?x=1#frag",
+                "https://example.org",
+                "https://example.org?next=/path",
+                "//example.org/iiif/manifest.json",
+                "/manifest.json",
+                "manifest.json",
+                "/m?next=http://host/",
+                "m#http://host/",
+                ""]
+        for url in urls:
+            self.assertEqual(_netloc(url), urlsplit(url).netloc, url)
+
     def test_valid_retrieval(self):
         """Ensure getting a manifest remotely works as expected."""
         manifest_resp = urlopen(self.v_url)
@@ -0,0 +1,71 @@
+import copy
+import ujson as json
+
+from tripoli import IIIFValidator
+
+from misirlou.helpers.manifest_utils.library_specific_exceptions import get_validator, get_harvard_edu_validator, reset_validator
+from misirlou.tests.mis_test import MisirlouTestSetup
+
+
+class ValidatorCacheTestCase(MisirlouTestSetup):
+    def setUp(self):
+        with open("misirlou/tests/fixtures/manifest.json") as f:
+            self.valid_manifest = json.loads(f.read())
+        self.invalid_manifest = {
+            "@context": "http://iiif.io/api/presentation/2/context.json",
+            "@id": "http://localhost:8888/misirlou/tests/fixtures/invalid.json",
+            "@type": "sc:Manifest"
+        }
+
+    def _results(self, validator, manifest):
+        """Validate a copy of manifest and return everything validation produced."""
+        validator.logger.disabled = True
+        validator.fail_fast = True
+        validator.validate(copy.deepcopy(manifest))
+        return (validator.is_valid,
+                [str(err) for err in validator.errors],
+                [str(warn) for warn in validator.warnings],
+                validator.corrected_doc)
+
+    def test_shared_per_library(self):
+        """One validator is kept per library configuration, not per host."""
+        default = get_validator("http://localhost:8888/manifest.json")
+        self.assertIs(default, get_validator("http://example.org/manifest.json"))
+
+        harvard = get_validator("http://iiif.lib.harvard.edu/manifests/1")
+        self.assertIsNot(harvard, default)
+        self.assertIs(harvard, get_validator("http://purl.stanford.edu/1/iiif/manifest.json"))
+        self.assertIs(harvard, get_validator("http://www.wdl.org/1/manifest.json"))
+
+    def test_no_state_carried_between_manifests(self):
+        """A reused validator gives the same results as a fresh one.
+
+        Validate two different manifests from one host in turn with the
+        shared validator, and check that validity, errors, warnings and the
+        corrected document of each run match those of a new validator.
+        """
+        urls = ["http://localhost:8888/misirlou/tests/fixtures/manifest.json",
+                "http://localhost:8888/misirlou/tests/fixtures/invalid.json",
+                "http://localhost:8888/misirlou/tests/fixtures/manifest.json"]
+        manifests = [self.valid_manifest, self.invalid_manifest, self.valid_manifest]
+        shared = get_validator(urls[0])
+        for url, manifest in zip(urls, manifests):
+            validator = get_validator(url)
+            self.assertIs(validator, shared)
+            expected = self._results(IIIFValidator(), manifest)
+            self.assertEqual(self._results(validator, manifest), expected)
+
+    def test_harvard_validator_reused(self):
+        """Library specific validators are reused without carrying state either."""
+        url = "http://iiif.lib.harvard.edu/manifests/1"
+        for manifest in (self.valid_manifest, self.invalid_manifest):
+            expected = self._results(get_harvard_edu_validator(), manifest)
+            self.assertEqual(self._results(get_validator(url), manifest), expected)
+
+    def test_reset_releases_corrected_doc(self):
+        """Resetting a validator drops the last manifest it validated."""
+        validator = get_validator("http://localhost:8888/misirlou/tests/fixtures/manifest.json")
+        self._results(validator, self.valid_manifest)
+        reset_validator(validator)
+        self.assertEqual(validator.corrected_doc, {})
+        self.assertIsNone(validator.ManifestValidator.corrected_doc)
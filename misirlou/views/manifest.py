@@ -80,9 +80,9 @@ class ManifestList(generics.ListCreateAPIView):
         # If there are manifests to import, create a celery group for the task.
         if lst:
             if len(lst) == 1:
-                g = group([import_single_manifest.s(imp.text, lst[0])])
+                g = group([import_single_manifest.s(imp.text, lst[0], man_hash=imp.manifest_hash)])
             else:
-                g = group([import_single_manifest.s(None, url) for url in lst]).skew(start=0, step=0.3)
+                g = group([import_single_manifest.s(None, url) for url in lst])
             task = g.apply_async(task_id=shared_id)
             task.save()
         else: